@@ -20,7 +20,7 @@ from .bib.bibnouns import (
     OCCURREDREPLACEMENTS,
 )
 
-from .bib.bibtools import keys, excludefields, FIELDS, Record, normalize
+from .bib.bibtools import keys, excludefields, FIELDS, Record, normalize, iter_normalized
 
 
 __all__ = [
@@ -39,7 +39,12 @@ __all__ = [
     "CITIES",
     "OCCURREDREPLACEMENTS",
     # bibtools
-    "keys, excludefields, FIELDS, Record, normalize",
+    "keys",
+    "excludefields",
+    "FIELDS",
+    "Record",
+    "normalize",
+    "iter_normalized",
     # delatex
     "dediacriticize"
     #'asciify', 'assignproofreaders', 'autoindex', 'bibnouns',
@@ -1,4 +1,6 @@
 import re
+import sys
+from types import MappingProxyType
 
 from langsci.bib.bibnouns import (
     LANGUAGENAMES,
@@ -9,27 +11,76 @@ from langsci.bib.bibnouns import (
     OCCURREDREPLACEMENTS,
 )
 
-PRESERVATIONPATTERN = re.compile(
-    r"\b(%s)\b"
-    % (
-        "|".join(
-            LANGUAGENAMES
-            + COUNTRIES
-            + OCEANNAMES
-            + CONTINENTNAMES
-            + CITIES
-            + OCCURREDREPLACEMENTS
-        )
+
+def _keyword_alternation(words):
+    """Join words into an alternation whose branches share their first character.
+
+    Words with different first characters cannot match at the same position and
+    the order of words within a group is kept, so the first listed word still wins,
+    but the engine no longer tries every single word at every position.
+    """
+    groups = {}
+    for word in words:
+        groups.setdefault(word[0], []).append(word[1:])
+    return "|".join(
+        "%s(?:%s)" % (first, "|".join(rests)) for first, rests in groups.items()
+    )
+
+
+def _propernouns():
+    return (
+        LANGUAGENAMES
+        + COUNTRIES
+        + OCEANNAMES
+        + CONTINENTNAMES
+        + CITIES
+        + OCCURREDREPLACEMENTS
     )
-)
+
+
+def _propernoun_alternation():
+    return _keyword_alternation(_propernouns())
+
+
+# Compiled patterns for proper nouns which have to be protected in titles:
+# PRESERVATIONPATTERN on its own, and TITLEPROTECTION_RE, which finds everything
+# checkdecapitalization protects in one pass. Its named groups tell what matched:
+# maintitle (see MAINTITLE_RE, with mainmark and subinitial), propernoun,
+# camelcase (see CAMELCASE_RE) and lonecapital (a capital between spaces).
+# Compiling them takes most of the import time of this module, so each is compiled
+# on its first access as bibpatterns.<name>, via the module __getattr__
+# LOWERCASE_PROPERNOUNS are the proper nouns without any cased capital letter, which
+# are the only matches of TITLEPROTECTION_RE possible in a title without capitals and [:?!]
+def __getattr__(name):
+    if name == "LOWERCASE_PROPERNOUNS":
+        value = tuple(word for word in _propernouns() if word == word.lower())
+    elif name == "PRESERVATIONPATTERN":
+        value = re.compile(r"\b(%s)\b" % _propernoun_alternation())
+    elif name == "TITLEPROTECTION_RE":
+        value = re.compile(
+            r"(?P<maintitle>(?P<mainmark>[:?!]) +(?P<subinitial>[a-zA-Z]))"
+            r"|(?P<propernoun>\b(?:%s)\b)"
+            r"|(?P<camelcase>%s)"
+            r"|(?P<lonecapital>(?<= )[A-Z](?= ))"
+            % (_propernoun_alternation(), CAMELCASE_RE.pattern)
+        )
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 # Compiled pattern for Binnenmajuskeln (= CamelCase), was CONFERENCEPATTERN
 CAMELCASE_RE = re.compile(r"([A-Z][A-Za-z0-9\-']*[A-Z][A-Za-z0-9\-']+)")
 
-# Compiled pattern for capitalized proceedings-like keywords, was PROCEEDINGSPATTERN
-PROCEEDINGS_RE = re.compile(r"\b(Proceedings|Workshop|Conference|Symposium)\b")
+# Compiled pattern for proceedings-like keywords in any case, was PROCEEDINGSPATTERN
+# The matched word tells capitalized (PROCEEDINGS_WORDS) from lowercase (PROCEEDINGS_LC_WORDS) keywords
+PROCEEDINGS_CI_RE = re.compile(r"\b(proceedings|workshop|conference|symposium)\b", re.IGNORECASE)
+PROCEEDINGS_WORDS = frozenset(("Proceedings", "Workshop", "Conference", "Symposium"))
+PROCEEDINGS_LC_WORDS = frozenset(("proceedings", "workshop", "conference", "symposium"))
 
-# Compiled pattern for lowercase proceedings-like keywords
+# Compiled patterns for capitalized and lowercase proceedings-like keywords,
+# no longer used by bibtools but kept for existing callers
+PROCEEDINGS_RE = re.compile(r"\b(Proceedings|Workshop|Conference|Symposium)\b")
 PROCEEDINGS_LC_RE = re.compile(r"\b(proceedings|workshop|conference|symposium)\b")
 
 # Compiled pattern for proceedings-like keywords (to flag suspicious booktitles fuzzily)
@@ -152,6 +203,10 @@ PUBLISHER_ADDRESS = {
     ("foris",): "{Dordrecht}",
     ("mit press",): "{Cambridge}",
 }
+# Flat substring -> address lookup, in the order of PUBLISHER_ADDRESS
+PUBLISHER_ADDRESS_FLAT = {
+    sub: address for subs, address in PUBLISHER_ADDRESS.items() for sub in subs
+}
 PUBLISHER_FULL = {
     "{Ablex Publishing Co}": "{Ablex}",
     "{Ablex Publishing Corporation}": "{Ablex}",
@@ -204,6 +259,23 @@ PUBLISHER_FULL = {
 }
 # todo: ELRA, SIL, Niemeyer, Lang, Reidel, Buske, Erlbaum, Steiner
 
+# Read-only views of the lookup tables above, with interned keys and values
+SCHOOL_FULL = MappingProxyType(
+    {sys.intern(k): sys.intern(v) for k, v in SCHOOL_FULL.items()}
+)
+SCHOOL_ADDRESS = MappingProxyType(
+    {sys.intern(k): sys.intern(v) for k, v in SCHOOL_ADDRESS.items()}
+)
+PUBLISHER_ADDRESS = MappingProxyType(
+    {tuple(map(sys.intern, k)): sys.intern(v) for k, v in PUBLISHER_ADDRESS.items()}
+)
+PUBLISHER_ADDRESS_FLAT = MappingProxyType(
+    {sys.intern(k): sys.intern(v) for k, v in PUBLISHER_ADDRESS_FLAT.items()}
+)
+PUBLISHER_FULL = MappingProxyType(
+    {sys.intern(k): sys.intern(v) for k, v in PUBLISHER_FULL.items()}
+)
+
 # Pattern definitions, mosty for parse_natural()
 author = r"(?P<author>.*?)"
 year = r"\(? *(?P<year>[12][0-9]{3})(?P<extrayear>[a-z]?) *\)?"
@@ -242,30 +314,36 @@ volumenumber = (
         rf"(?P<volume_only>{joint})"
     rf")"
 )
+# Shared head of all entry patterns below except BOOK: author, then year
+# The entry patterns all start with the lazy author group, so a search can only
+# succeed at the start of a line. Anchoring them there spares the engine a full
+# retry from every other position of a reference which does not match.
+head = rf"{author}[., ]*{year}[., ]*"
+
 BOOK = re.compile(
-    "{author}[., ]* {ed}[., ]*{year}[\., ]*{title}".format(
+    "^{author}[., ]* {ed}[., ]*{year}[\., ]*{title}".format(
         author=author,
         ed=ed_flag,
         year=year,
         title=title_g,
-    )
+    ),
+    re.MULTILINE,
 )
 ARTICLE = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} +{journal}[.,]? {volumenumber}(?: *[.:,] *| +)?(?:{pages})?\. *{note}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} +{journal}[.,]? {volumenumber}(?: *[.:,] *| +)?(?:{pages})?\. *{note}".format(
+        head=head,
         title=title_ne,
         endmark=endmark,
         journal=journal,
         volumenumber=volumenumber,
         pages=pages,
         note=note,
-    )
+    ),
+    re.MULTILINE,
 )
 INCOLLECTION = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} In:? {editor} {ed}[.,]? {booktitle}{endmark1} \(?{pages}\)?\. +{pubaddrng}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} In:? {editor} {ed}[.,]? {booktitle}{endmark1} \(?{pages}\)?\. +{pubaddrng}".format(
+        head=head,
         title=title,
         endmark=endmark,
         editor=editor,
@@ -274,12 +352,12 @@ INCOLLECTION = re.compile(
         endmark1=endmark1,
         pages=pages,
         pubaddrng=pubaddrng,
-    )
+    ),
+    re.MULTILINE,
 )
 INCOLLECTIONPARENS = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} In:? {editor} {ed}[.,]? {booktitle}[.,]? \((?:{pword})?{pages}\)\. +{pubaddrng}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} In:? {editor} {ed}[.,]? {booktitle}[.,]? \((?:{pword})?{pages}\)\. +{pubaddrng}".format(
+        head=head,
         title=title,
         endmark=endmark,
         editor=editor,
@@ -288,65 +366,77 @@ INCOLLECTIONPARENS = re.compile(
         pword=pword,
         pages=pages,
         pubaddrng=pubaddrng,
-    )
+    ),
+    re.MULTILINE,
 )
 INCOLLECTIONMISSING = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} *In:? *{editor} *{ed}[.,]? {booktitle}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} *In:? *{editor} *{ed}[.,]? {booktitle}".format(
+        head=head,
         title=title,
         endmark=endmark,
         editor=editor,
         ed=ed,
         booktitle=booktitle,
-    )
+    ),
+    re.MULTILINE,
 )
 MASTERSTHESIS = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} +{pubaddrng}\. *{mathesis}{note}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} +{pubaddrng}\. *{mathesis}{note}".format(
+        head=head,
         title=title,
         endmark=endmark,
         pubaddrng=pubaddrng,
         mathesis=mathesis,
         note=note,
-    )
+    ),
+    re.MULTILINE,
 )
 PHDTHESIS = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} +{pubaddrng}\. *{phdthesis}{note}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} +{pubaddrng}\. *{phdthesis}{note}".format(
+        head=head,
         title=title,
         endmark=endmark,
         pubaddrng=pubaddrng,
         phdthesis=phdthesis,
         note=note,
-    )
+    ),
+    re.MULTILINE,
 )
 XMISC = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} *(note)".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} *(note)".format(
+        head=head,
         title=title,
         endmark=endmark,
         note=note,
-    )
+    ),
+    re.MULTILINE,
 )
 MISC = re.compile(
-    "{author}[., ]*{year}[., ]*{title}{endmark} *{note}".format(
-        author=author,
-        year=year,
+    "^{head}{title}{endmark} *{note}".format(
+        head=head,
         title=title_g,
         endmark=endmark,
         note=note,
-    )
+    ),
+    re.MULTILINE,
 )
 
+# Compiled pattern for a quick check on the year, which all entry patterns require
+YEAR_RE = re.compile(r"[12][0-9]{3}")
+
+# Compiled pattern for a quick check on thesis indications before MASTERSTHESIS and PHDTHESIS
+# A match of mathesis is found as lastgroup "ma", and as every match of mathesis contains
+# a match of phdthesis, PHDTHESIS can only match if THESIS_DISPATCH_RE matches at all
+THESIS_DISPATCH_RE = re.compile(rf"(?P<ma>{mathesis})|(?P<phd>{phdthesis})")
+
 # Compiled patterns for determining @incollection: year then editor indication
 EDITOR = re.compile(f"{year}.*{ed}")
 
 PUBADDR = re.compile(pubaddr)
 
+# Compiled pattern for pages at the head of a note
+NOTE_PAGES_RE = re.compile(rf"^ *{pages}[ .,;:]*")
+
 # Legacy
 PAGES = re.compile(pages)
 URLDATE = re.compile(rf"[\[\(]?({yyyy}-{mm}-{dd}|{dd}.{mm}.{yyyy}|{dd}/{mm}/{yyyy}|{mm}/{dd}/{yyyy})[\]\)]?")
@@ -10,6 +10,8 @@ Provides
 
 import sys
 import re
+import functools
+import multiprocessing
 import pprint
 import glob
 import string
@@ -25,8 +27,8 @@ from langsci.bib import bibpatterns
 # Value: Boolean flag (True) indicating seen
 keys = {}  
 
-# Fields to exclude from the output
-excludefields = [
+# Fields to exclude from the output; a frozenset, as it is only used for membership tests
+excludefields = frozenset({
     "abstract",
     "language",
     "date-added",
@@ -49,7 +51,7 @@ excludefields = [
     "bdsk-url-1",
     "bdsk-url-2",
     "bdsk-url-3",
-]
+})
 
 # Fields to output; currently unused
 FIELDS = [
@@ -78,6 +80,132 @@ name_fields = [
     "translator"
 ]
 
+# Compiled patterns for the extract_* helpers
+_URL_RE = re.compile(r"(https?://[^ ]+)\.?$")
+_DOI_RE = re.compile(r"(?:doi(?::| )\s*)?(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)\.?$", re.IGNORECASE)
+_PUBADDR_RE = re.compile(r"^(.+?)([.!?]) ([^:]+?): ([^:]+?)\.?$")
+_SERIES_RE = re.compile(r"^(?P<newtitle>.*?)\s*\((?P<series>.+?)\s+(?P<number>[-.0-9/]+)\)\s*$")
+_PP_CLEAN_RE = re.compile(r"[.,]?\s*\(?\b(pp\.?|p\.)\b.*$")
+
+# Compiled patterns for parse_bibtex()
+_TYPKEYFIELDS_RE = re.compile(bibpatterns.TYPKEYFIELDS)
+_TRAILING_COMMA_RE = re.compile(r'\s*,\s*}$')
+# One field/value pair: a braced value runs to the end of the line,
+# a quoted value (no internal quote marks, even escaped) or an unbraced
+# value is followed by an optional comma and possibly more pairs.
+_FIELD_RE = re.compile(
+    r'\s*(\w+)\s*=\s*'
+    r'(?:\{\s*(?P<braced>.*?)\s*\}\s*,?\s*$'
+    r'|"\s*(?P<quoted>[^"]*?)\s*"\s*,?\s*'
+    r'|(?P<bare>[^,{}"]*)\s*,?\s*)'
+)
+
+# Compiled patterns for checkpages()
+_PAGES_COUNT_RE = re.compile(r"^\d+\s*(pp\.?|pages)$", re.IGNORECASE)
+_DASH_NORM_RE = re.compile(r"\s*[‒–—−-]+\s*")
+_PAGES_SEP_RE = re.compile(r"\s*[;,]\s*")
+_PAGES_UNIT = r'(?:[a-zA-Z]?\d+|[ivxlcdm]+)'
+_PAGES_ENTRY = fr'(?:{_PAGES_UNIT}|{_PAGES_UNIT}--{_PAGES_UNIT})'
+_PAGES_VALID_RE = re.compile(fr'^{_PAGES_ENTRY}(?:, {_PAGES_ENTRY})*$')
+_PAGES_ROMAN_RE = re.compile(r'^[IVXLCDM]+--[IVXLCDM]+$')
+_PAGES_RANGE_RE = re.compile(fr'({_PAGES_UNIT})--({_PAGES_UNIT})')
+
+def _protect_title_match(match):
+    """Replacement for a match of bibpatterns.TITLEPROTECTION_RE in checkdecapitalization()"""
+    kind = match.lastgroup
+    if kind == "maintitle":
+        return match.group("mainmark") + " {" + match.group("subinitial").upper() + "}"
+    if kind == "lonecapital":
+        return "{{" + match.group() + "}}"
+    # propernoun, camelcase
+    return "{" + match.group() + "}"
+
+# Compiled patterns for move_volume()
+_TRAILING_PUNCT_RE = re.compile(r'^\{(.*?)[,:;. ]+\}$')
+_LEADING_PUNCT_RE = re.compile(r'^\{[,:;. ]+(.*?)\}$')
+
+# Compiled patterns for checkinitials()
+_INITIALS_NOSPACE_RE = re.compile(r"([A-Z])\.([A-Z])")
+_INITIAL_NODOT_RE = re.compile(r" ([A-Z])(?= )")
+_FINAL_INITIAL_NODOT_RE = re.compile(r" ([A-Z])}$")
+_CAPCAP_RE = re.compile(r' [A-Z][A-Z] ')
+_FINAL_CAPCAP_RE = re.compile(r' [A-Z][A-Z]}$')
+
+# Edition numerals for checkedition()
+_ORDINAL_MAP = {
+    "first": "1", "1st": "1",
+    "second": "2", "2nd": "2",
+    "third": "3", "3rd": "3",
+    "fourth": "4", "4th": "4",
+    "fifth": "5", "5th": "5",
+    "sixth": "6", "6th": "6",
+    "seventh": "7", "7th": "7",
+    "eighth": "8", "8th": "8",
+    "ninth": "9", "9th": "9",
+    "tenth": "10", "10th": "10"
+}
+_EDITION_KEYWORDS = frozenset({"ed", "ed.", "edn", "edn.", "edition"})
+
+# Month numerals for checkmonth()
+_MONTH_MAP = {
+    "jan": "1", "feb": "2", "mar": "3", "apr": "4", "may": "5", "jun": "6",
+    "jul": "7", "aug": "8", "sep": "9", "oct": "10", "nov": "11", "dec": "12",
+    "january": "1", "february": "2", "march": "3", "april": "4", "june": "6", "july": "7", 
+    "august": "8", "september": "9", "october": "10", "november": "11", "december": "12",
+}
+
+# Fields checked by checkampersand(), in order, mapped to whether they are name fields:
+# an ampersand in a name field becomes "and", elsewhere it is escaped
+_AMPERSAND_FIELDS = dict.fromkeys(name_fields, True)
+_AMPERSAND_FIELDS.update(dict.fromkeys([
+    "address", "publisher", "school", "institution", "journal", "series", 
+    "title", "booktitle", "maintitle", "subtitle", 
+    "volume", "number", "note", "howpublished", "addendum"
+], False))
+
+# Full school name and address (or None) for every known school name,
+# whether abbreviated or already in full
+_SCHOOL_INFO = {
+    school: (school, address) for school, address in bibpatterns.SCHOOL_ADDRESS.items()
+}
+_SCHOOL_INFO.update(
+    (short, (full, bibpatterns.SCHOOL_ADDRESS.get(full)))
+    for short, full in bibpatterns.SCHOOL_FULL.items()
+)
+
+# Mandatory fields per kind of entry, in the order in which missing ones are reported
+_MANDATORY_FIELDS = {
+    "thesis": ("author", "title", "address", "school", "year"),
+    "book": ("year", "title", "address", "publisher"),
+    "article": ("author", "year", "title", "journal", "volume"),
+    "misc": ("author", "title", "year"),
+    "other": ("author", "title", "year"),
+}
+
+# Entry types with their own checks, not covered by checkothertype()
+_KNOWN_TYPES = frozenset({
+    "article", "book", 
+    "inbook", "incollection", "inproceedings",
+    "thesis", "phdthesis", "mastersthesis", 
+    "misc"
+})
+
+# Sites flagged by checkurl(), as they are not repositories
+_NONSITES = (
+    "ebrary",
+    "degruyter",
+    "myilibrary",
+    "academia",
+    "ebscohost",
+    "researchgate",
+)
+
+# Compiled pattern for the doi-like prefixes removed by checkdoi()
+_DOI_PREFIX_RE = re.compile(r"\b(?:doi:\s*|https?://(?:dx\.)?doi\.org/|doi\.org/)", re.IGNORECASE)
+
+# Compiled pattern for checkthesis()
+_THESIS_TYPE_RE = re.compile(r"\s.*?(Thesis|Dissertation)")
+
 def trim_braces(s):
     if s.startswith("{") and s.endswith("}"):
         return s[1:-1]
@@ -85,18 +213,40 @@ def trim_braces(s):
         
 def add_braces(s):
     return "{" + s + "}"
+
+def _split_bibtex_fields(remainder):
+    """
+    Split the fields of a BibTeX entry on a closing brace followed by
+    a comma and a newline, and collapse all whitespace in each line.
+    """
+    start = 0
+    nl = remainder.find("\n")
+    while nl != -1:
+        i = nl
+        while i > start and remainder[i - 1] in " \t":
+            i -= 1
+        if i > start and remainder[i - 1] == ",":
+            i -= 1
+            while i > start and remainder[i - 1] in " \t":
+                i -= 1
+            if i > start and remainder[i - 1] == "}":
+                yield " ".join(remainder[start:i].split())
+                start = nl + 1
+                while start < len(remainder) and remainder[start].isspace():
+                    start += 1
+        nl = remainder.find("\n", max(nl + 1, start))
+    yield " ".join(remainder[start:].split())
     
 def clean_and_brace_natural(d):
-    for k in list(d.keys()):
-        v = d[k]
+    cleaned_d = {}
+    for k, v in d.items():
         if not v or not isinstance(v, str):
-            del d[k]
             continue
-        cleaned = " ".join(v.strip().split())
-        if cleaned == "":
-            del d[k]
-        else:
-            d[k] = add_braces(cleaned)
+        cleaned = " ".join(v.split())
+        if cleaned:
+            cleaned_d[k] = "{" + cleaned + "}"
+    d.clear()
+    d.update(cleaned_d)
 
 def is_real_value(x):
     """
@@ -110,19 +260,17 @@ def is_real_value(x):
         - An injected error like "{\\biberror{...}}"
     """
     
-    if x is None or x == "":
-        return False
-    if x == "{}":
+    if not x or x == "{}":
         return False
-    if x.startswith("{\\biberror{"):
-        return False
-    return True
+    return not x.startswith("{\\biberror{")
 
 def extract_url(tail: str) -> tuple[str, str | None]:
     """
     Extract an URL from the tail string, and return the cleaned tail and the URL.
     """
-    match = re.search(r"(https?://[^ ]+)\.?$", tail)
+    if "http" not in tail:
+        return tail, None
+    match = _URL_RE.search(tail)
     if match:
         url = match.group(1)
         clean_tail = tail[:match.start()].rstrip(" .,")
@@ -133,11 +281,9 @@ def extract_doi(tail: str) -> tuple[str, str | None]:
     """
     Extract a DOI from the tail string, and return the cleaned tail and the DOI.
     """
-    match = re.search(
-        r"(?:doi(?::| )\s*)?(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)\.?$",
-        tail,
-        re.IGNORECASE
-    )
+    if "10." not in tail:
+        return tail, None
+    match = _DOI_RE.search(tail)
     if match:
         doi = match.group(1)
         clean_tail = tail[:match.start()].rstrip(" .,")
@@ -149,7 +295,7 @@ def extract_pubaddr(tail: str) -> tuple[str, dict[str, str]]:
     Extract a trailing 'address: publisher' from the tail string.
     Returns the cleaned tail and a dict with 'address' and 'publisher' if matched.
     """
-    match = re.search(r"^(.+?)([.!?]) ([^:]+?): ([^:]+?)\.?$", tail)
+    match = _PUBADDR_RE.search(tail)
     if match:
         cleaned_tail = match.group(1)
         endmark = match.group(2)
@@ -166,7 +312,7 @@ def extract_seriesnumber(tail: str) -> tuple[str, dict[str, str] | None]:
     'Language and Cognition (Studies in Linguistics 12)'
     Returns the cleaned title and a dict with 'series' and 'number' if matched.
     """
-    match = re.search(r"^(?P<newtitle>.*?)\s*\((?P<series>.+?)\s+(?P<number>[-.0-9/]+)\)\s*$", tail)
+    match = _SERIES_RE.search(tail)
     if match:
         newtitle = match.group("newtitle").strip(" .")
         return newtitle, {
@@ -180,7 +326,7 @@ def extract_pages_from_note(note):
     # Used to post-process pages value in unusually separated book reference.
     if not note:
         return None, note
-    match = re.match(rf"^ *{bibpatterns.pages}[ .,;:]*", note)
+    match = bibpatterns.NOTE_PAGES_RE.match(note)
     if match:
         pages = match.group("pages").strip()
         cleaned_note = note[match.end():].lstrip()
@@ -189,7 +335,7 @@ def extract_pages_from_note(note):
 
 def clean_booktitle(booktitle):
     # Remove trailing fragments like "pp.", "(pp.", "(pages", etc. from a greedy booktitle.
-    return re.sub(r"[.,]?\s*\(?\b(pp\.?|p\.)\b.*$", "", booktitle).strip()
+    return _PP_CLEAN_RE.sub("", booktitle).strip()
 
 def get_hyphen(value):
     for h in ("–", "—", "-"):  # en dash, em dash, hyphen-minus
@@ -197,18 +343,202 @@ def get_hyphen(value):
             return h
     return None
 
+# Compiled pattern for a range of two unsigned integers, e.g. "2-3"
+_JOINT_ISSUE_RE = re.compile(r"\s*(\d+)\s*([–—-])\s*(\d+)\s*")
+
 def is_joint_issue(value, hyphen):
     # Decides if value, e.g. "2-3", is likely a joint issue number.
     # Used to post-process ambiguous number or pages value.
-    parts = value.split(hyphen)
-    if len(parts) != 2:
+    m = _JOINT_ISSUE_RE.fullmatch(value)
+    if not m or m.group(2) != hyphen:
         return False
-    try:
-        first = int(parts[0].strip())
-        second = int(parts[1].strip())
-        return 0 < second - first <= 3
-    except ValueError:
+    return 0 < int(m.group(3)) - int(m.group(1)) <= 3
+
+def _natural_thesis(m, s, d):
+    """Fill d from a MASTERSTHESIS or PHDTHESIS match."""
+    d["author"] = m.group("author")
+    d["title"] = m.group("title")
+    d["endmark"] = m.group("endmark")
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["address"] = m.group("address")
+    d["school"] = m.group("publisher")
+    d["note"] = m.group("note")
+    return True
+
+def _natural_incollection(m, s, d):
+    """Fill d from an INCOLLECTION match."""
+    d["author"] = m.group("author")
+    d["editor"] = m.group("editor")
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["title"] = m.group("title")
+    d["endmark"] = m.group("endmark")
+    d["booktitle"] = clean_booktitle(m.group("booktitle"))
+    d["endmark1"] = m.group("endmark1")
+    d["pages"] = m.group("pages")
+    d["address"] = m.group("address")
+    d["publisher"] = m.group("publisher")
+    tail = d["publisher"]
+    tail, url = extract_url(tail)
+    if url:
+        d["url"] = url
+    tail, doi = extract_doi(tail)
+    if doi:
+        d["doi"] = doi
+    d["publisher"] = tail.rstrip(" .") if tail.strip() else None
+    return True
+
+def _natural_incollectionparens(m, s, d):
+    """Fill d from an INCOLLECTIONPARENS match."""
+    d["author"] = m.group("author")
+    d["editor"] = m.group("editor")
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["title"] = m.group("title")
+    d["endmark"] = m.group("endmark")
+    d["booktitle"] = clean_booktitle(m.group("booktitle"))
+    d["pages"] = m.group("pages")
+    d["address"] = m.group("address")
+    d["publisher"] = m.group("publisher")
+    tail = d["publisher"]
+    tail, url = extract_url(tail)
+    if url:
+        d["url"] = url
+    tail, doi = extract_doi(tail)
+    if doi:
+        d["doi"] = doi
+    d["publisher"] = tail.rstrip(" .") if tail.strip() else None
+    return True
+
+def _natural_incollectionmissing(m, s, d):
+    """Fill d from an INCOLLECTIONMISSING match."""
+    d["author"] = m.group("author")
+    d["editor"] = m.group("editor")
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["title"] = m.group("title")
+    d["endmark"] = m.group("endmark")
+    d["booktitle"] = m.group("booktitle")
+    tail = d["booktitle"]
+    tail, url = extract_url(tail)
+    if url:
+        d["url"] = url
+    tail, doi = extract_doi(tail)
+    if doi:
+        d["doi"] = doi
+    tail, pubaddr = extract_pubaddr(tail)
+    if pubaddr:
+        d.update(pubaddr)
+    d["booktitle"] = tail if tail.strip() else None
+    return True
+
+def _natural_article(m, s, d):
+    """Fill d from an ARTICLE match."""
+    d["author"] = m.group("author")
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["title"] = m.group("title")
+    d["endmark"] = m.group("endmark")
+    d["journal"] = m.group("journal")
+    volume = (
+        m.group("volume_paren")
+        or m.group("volume_sep")
+        or m.group("volume_only")
+    )
+    number = (
+        m.group("number_paren")
+        or m.group("number_sep")
+    )
+    pages = m.group("pages")
+    note = m.group("note")
+    d["volume"] = volume
+    if number:
+        d["number"] = number
+    if pages:
+        d["pages"] = pages
+    else:
+        hyphen = get_hyphen(number)
+        if hyphen:
+            extracted_pages, cleaned_note = extract_pages_from_note(note)
+            is_joint = is_joint_issue(number, hyphen)
+            if is_joint and extracted_pages:
+                # case 1 "Journal of Syntax 12, 2–4. 55–70"
+                d["number"] = number
+                d["pages"] = extracted_pages
+                note = cleaned_note
+            elif is_joint and not extracted_pages:
+                # case 2 "Journal of Syntax 12, 2–4"
+                # Ambiguous. Examine original separator between bolume and number? Probe if doi or url exists?
+                d["pages"] = number
+                d["number"] = None
+            elif not is_joint and extracted_pages:
+                # case 3 "Journal of Syntax 12, 55–70. 200–215"
+                # This should never happen
+                d["pages"] = number + ", " + extracted_pages
+                note = cleaned_note
+            else: # not is_joint_issue and not extracted_pages
+                # case 4 "Journal of Syntax 12, 99–113"
+                d["pages"] = number
+                d["number"] = None # This will be deleted in final processing before d is assigned to self.fields
+    d["note"] = note
+    return True
+
+def _natural_book(m, s, d):
+    """Fill d from a BOOK match; returns False if it lacks both an editor and a publisher."""
+    editor_flag = m.group("ed")
+    has_pubaddr = bibpatterns.PUBADDR.search(s)
+    if not (editor_flag or has_pubaddr):
+        # A BOOK match without an editor or a publisher is left unparsed
         return False
+    d["author"] = m.group("author")
+    if editor_flag:
+        d["editor"] = m.group("author")
+        d["author"] = None
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["title"] = m.group("title")
+    tail = d["title"]
+    tail, url = extract_url(tail)
+    if url:
+        d["url"] = url
+    tail, doi = extract_doi(tail)
+    if doi:
+        d["doi"] = doi
+    if has_pubaddr:
+        tail, pubaddr = extract_pubaddr(tail)
+        if pubaddr:
+            d.update(pubaddr)
+    tail, seriesnumber = extract_seriesnumber(tail)
+    if seriesnumber:
+        d.update(seriesnumber)
+    d["title"] = tail if tail.strip() else None
+    return True
+
+def _natural_misc(m, s, d):
+    """Fill d from a MISC match."""
+    d["author"] = m.group("author")
+    d["year"] = m.group("year")
+    d["extrayear"] = m.group("extrayear")
+    d["title"] = m.group("title")
+    d["endmark"] = m.group("endmark")
+    d["note"] = m.group("note")
+    return True
+
+# Entry patterns tried by Record._parse_natural, in order:
+# (search or match method, gate which must be set for the pattern to be tried, typ, handler).
+# The first pattern that matches decides the entry; its handler fills the field dict
+# and returns False if the match is not accepted, which leaves the entry as an empty misc.
+_NATURAL_PARSERS = (
+    (bibpatterns.MASTERSTHESIS.search, "ma", "mastersthesis", _natural_thesis),
+    (bibpatterns.PHDTHESIS.search, "thesis", "phdthesis", _natural_thesis),
+    (bibpatterns.INCOLLECTION.search, "editor", "incollection", _natural_incollection),
+    (bibpatterns.INCOLLECTIONPARENS.search, "editor", "incollection", _natural_incollectionparens),
+    (bibpatterns.INCOLLECTIONMISSING.search, "editor", "incollection", _natural_incollectionmissing),
+    (bibpatterns.ARTICLE.search, None, "article", _natural_article),
+    (bibpatterns.BOOK.match, None, "book", _natural_book),
+    (bibpatterns.MISC.search, None, "misc", _natural_misc),
+)
 
 class Record:
     """
@@ -262,9 +592,11 @@ class Record:
             - Parses the input string using either `parse_bibtex()` or `parse_natural()`.
             - Calls `conform()` to normalize field values, first by field then by BibTeX entry type.
             - Calls `report()` to print accumulated syntax warnings (stored in `self.errors`).
+            - Skips both if `restrict` is True and the key is not in `inkeysd`.
         """
         
         self.raw_entry = s
+        self.typ = None
         self.parsing_failed = False
         self.errors = []
         self.restrict = restrict
@@ -274,7 +606,9 @@ class Record:
             self.parse_bibtex(s)
         else:
             self.parse_natural(s)
-        if not self.parsing_failed:
+        # With restrict, entries not in inkeysd are neither output nor reported,
+        # so their checks and error messages would go unused
+        if not self.parsing_failed and not (self.restrict and self.key not in self.inkeysd):
             self.conform()
             self.report()
  
@@ -310,24 +644,23 @@ class Record:
             - The parser may fail if a field contains the sequence "},\n" within a properly balanced value.
         """
         
-        m = re.match(bibpatterns.TYPKEYFIELDS, s)
+        m = _TYPKEYFIELDS_RE.match(s)
         if not m:
             self.parsing_failed = True
             return
         
-        self.typ = m.group(1).lower()
+        # interned, like the type names it is compared with and looked up by
+        self.typ = sys.intern(m.group(1).lower())
         self.key = m.group(2)
         remainder = m.group(3).strip()        
 
         # analyze remainder
         # remove possible comma at end of last field/value pair, to improve split
-        remainder = re.sub(r'\s*,\s*}$', '}', remainder)
-
-        # Split bibentry on closing brace followed by a comma and a newline
-        lines = re.split(r"(?<=\})[ \t]*,[ \t]*\n\s*", remainder)
+        remainder = _TRAILING_COMMA_RE.sub('}', remainder)
 
-        # Clean all whitespace in lines
-        lines = [re.sub(r'\s+', ' ', line.strip()) for line in lines]
+        # Split bibentry on closing brace followed by a comma and a newline,
+        # and clean all whitespace in lines
+        lines = list(_split_bibtex_fields(remainder))
         
         if not any(lines):
             self.errors.append("No valid field/value lines found")
@@ -340,71 +673,24 @@ class Record:
         self.fields = {}
         for line in lines:
             # print(f"Parsing line: {line}") # DEBUG
-            while line:
-                # Case: Braced value
-                match = re.match(
-                    r'^\s*(\w+)\s*=\s*\{\s*(.*?)\s*\}\s*,?\s*$', 
-                    line
-                )
-                if match:
-                    field, value = match.groups()
-                    if value == "":
-                        # print(f"Skipping empty braced value for field '{field}'") #DEBUG
-                        break
-                    self.fields[field.lower()] = add_braces(value)
-                    break  # Braced value is terminal
-
-                # Case: Quoted value (BUT no internal quote marks, even escaped) 
-                match = re.match(
-                    r'^\s*(\w+)\s*=\s*"\s*([^"]*?)\s*"\s*,?\s*(.*)$',
-                    line
-                )
-                if match:
-                    field, value, remainder = match.groups()
-                    # print(f'Matched: field = {field}, value = "{value}", remainder = {remainder}') # DEBUG
-                    field = field.lower()
-                    if value:
-                        if remainder:
-                            self.fields[field] = add_braces(value)
-                            line = remainder
-                            continue
-                        else:
-                            self.fields[field] = add_braces(value)
-                            break
-                    else:
-                        if remainder:
-                            line = remainder
-                            continue
-                        else:
-                            # print(f"Skipping empty quoted value for field '{field}'") # DEBUG
-                            break
-
-                # Case: Unbraced value
-                match = re.match(
-                    r'^\s*(\w+)\s*=\s*([^,{}"]*)\s*,?\s*(.*)$', 
-                    line
-                )
-                if match:
-                    field, value, remainder = match.groups()
-                    # print(f'Matched: field = {field}, value = {value}, remainder = {remainder}') # DEBUG
-                    field = field.lower()
-                    if value:
-                        if remainder:
-                            self.fields[field] = value
-                            line = remainder
-                            continue
-                        else:
-                            self.fields[field] = value
-                            break
-                    else:
-                        if remainder:
-                            line = remainder
-                            continue
-                        else:
-                            # print(f"Skipping empty unbraced value for field '{field}'") # DEBUG
-                            break
-                else:
+            pos = 0
+            while pos < len(line):
+                match = _FIELD_RE.match(line, pos)
+                if not match:
                     break
+                # Interned, so that all records share one string per field name
+                field = sys.intern(match.group(1).lower())
+                braced, quoted, bare = match.group("braced", "quoted", "bare")
+                # print(f"Matched: field = {field}, value = {match.group(2, 3, 4)}") # DEBUG
+                if braced is not None:
+                    if braced:
+                        self.fields[field] = "{" + braced + "}"
+                    break  # Braced value is terminal
+                if quoted:
+                    self.fields[field] = "{" + quoted + "}"
+                elif bare:
+                    self.fields[field] = bare
+                pos = match.end()
 
         if not self.fields:
             self.errors.append("No fields parsed from BibTeX entry")
@@ -416,194 +702,58 @@ class Record:
         keys[self.key] = True
 
     def parse_natural(self, s):
-        s = s.strip()
+        """
+        Parse a bibliography list entry.
+
+        Sets `self.typ`, `self.key` and `self.fields`, or `self.parsing_failed` for empty input.
+        """
         self.parsing_failed = False
         self.typ = "misc"
         self.key = None
+        parsed = self._parse_natural(s.strip())
+        if parsed is None:
+            self.parsing_failed = True
+            return
+        self.typ, self.key, fields = parsed
+        self.fields = dict(fields)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_natural(s):
+        """
+        Parse a stripped bibliography list entry into (typ, key, fields), with fields as a tuple of pairs.
+        Returns None for empty input.
+        The result is cached per entry string, so it must stay immutable.
+        """
+        typ = "misc"
         d = {}
         
         # Early exit for empty input
         if not s:
-            self.parsing_failed = True
-            return
-
-        m = bibpatterns.MASTERSTHESIS.search(s)
-        if m:
-            self.typ = "mastersthesis"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["address"] = m.group("address")
-            d["school"] = m.group("publisher")
-            d["note"] = m.group("note")
-        elif (m := bibpatterns.PHDTHESIS.search(s)):
-            self.typ = "phdthesis"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["address"] = m.group("address")
-            d["school"] = m.group("publisher")
-            d["note"] = m.group("note")
-        elif (bibpatterns.EDITOR.search(s)) and (m := bibpatterns.INCOLLECTION.search(s)):
-            self.typ = "incollection"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["editor"] = m.group("editor")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["booktitle"] = clean_booktitle(m.group("booktitle"))
-            d["endmark1"] = m.group("endmark1")
-            d["pages"] = m.group("pages")
-            d["address"] = m.group("address")
-            d["publisher"] = m.group("publisher")
-            tail = d["publisher"]
-            tail, url = extract_url(tail)
-            if url:
-                d["url"] = url
-            tail, doi = extract_doi(tail)
-            if doi:
-                d["doi"] = doi
-            d["publisher"] = tail.rstrip(" .") if tail.strip() else None
-        elif (bibpatterns.EDITOR.search(s)) and (m := bibpatterns.INCOLLECTIONPARENS.search(s)):
-            self.typ = "incollection"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["editor"] = m.group("editor")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["booktitle"] = clean_booktitle(m.group("booktitle"))
-            d["pages"] = m.group("pages")
-            d["address"] = m.group("address")
-            d["publisher"] = m.group("publisher")
-            tail = d["publisher"]
-            tail, url = extract_url(tail)
-            if url:
-                d["url"] = url
-            tail, doi = extract_doi(tail)
-            if doi:
-                d["doi"] = doi
-            d["publisher"] = tail.rstrip(" .") if tail.strip() else None
-        elif (bibpatterns.EDITOR.search(s)) and (m := bibpatterns.INCOLLECTIONMISSING.search(s)):
-            self.typ = "incollection"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["editor"] = m.group("editor")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["booktitle"] = m.group("booktitle")
-            tail = d["booktitle"]
-            tail, url = extract_url(tail)
-            if url:
-                d["url"] = url
-            tail, doi = extract_doi(tail)
-            if doi:
-                d["doi"] = doi
-            tail, pubaddr = extract_pubaddr(tail)
-            if pubaddr:
-                d.update(pubaddr)
-            d["booktitle"] = tail if tail.strip() else None
-        elif (m := bibpatterns.ARTICLE.search(s)):
-            self.typ = "article"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["journal"] = m.group("journal")
-            volume = (
-                m.group("volume_paren")
-                or m.group("volume_sep")
-                or m.group("volume_only")
-            )
-            number = (
-                m.group("number_paren")
-                or m.group("number_sep")
-            )
-            pages = m.group("pages")
-            note = m.group("note")
-            d["volume"] = volume
-            if number:
-                d["number"] = number
-            if pages:
-                d["pages"] = pages
-            else:
-                hyphen = get_hyphen(number)
-                if hyphen:
-                    extracted_pages, cleaned_note = extract_pages_from_note(note)
-                    is_joint = is_joint_issue(number, hyphen)
-                    if is_joint and extracted_pages:
-                        # case 1 "Journal of Syntax 12, 2–4. 55–70"
-                        d["number"] = number
-                        d["pages"] = extracted_pages
-                        note = cleaned_note
-                    elif is_joint and not extracted_pages:
-                        # case 2 "Journal of Syntax 12, 2–4"
-                        # Ambiguous. Examine original separator between bolume and number? Probe if doi or url exists?
-                        d["pages"] = number
-                        d["number"] = None
-                    elif not is_joint and extracted_pages:
-                        # case 3 "Journal of Syntax 12, 55–70. 200–215"
-                        # This should never happen
-                        d["pages"] = number + ", " + extracted_pages
-                        note = cleaned_note
-                    else: # not is_joint_issue and not extracted_pages
-                        # case 4 "Journal of Syntax 12, 99–113"
-                        d["pages"] = number
-                        d["number"] = None # This will be deleted in final processing before d is assigned to self.fields
-            d["note"] = note
-        elif (m := bibpatterns.BOOK.match(s)):
-            editor_flag = m.group("ed")
-            has_pubaddr = bibpatterns.PUBADDR.search(s)
-            if (editor_flag or has_pubaddr):
-                self.typ = "book"
-                self.parsing_failed = False
-                d["author"] = m.group("author")
-                if editor_flag:
-                    d["editor"] = m.group("author")
-                    d["author"] = None
-                d["year"] = m.group("year")
-                d["extrayear"] = m.group("extrayear")
-                d["title"] = m.group("title")
-                tail = d["title"]
-                tail, url = extract_url(tail)
-                if url:
-                    d["url"] = url
-                tail, doi = extract_doi(tail)
-                if doi:
-                    d["doi"] = doi
-                if has_pubaddr:
-                    tail, pubaddr = extract_pubaddr(tail)
-                    if pubaddr:
-                        d.update(pubaddr)
-                tail, seriesnumber = extract_seriesnumber(tail)
-                if seriesnumber:
-                    d.update(seriesnumber)
-                d["title"] = tail if tail.strip() else None
-        elif (m := bibpatterns.MISC.search(s)):
-            self.typ = "misc"
-            self.parsing_failed = False
-            d["author"] = m.group("author")
-            d["year"] = m.group("year")
-            d["extrayear"] = m.group("extrayear")
-            d["title"] = m.group("title")
-            d["endmark"] = m.group("endmark")
-            d["note"] = m.group("note")
-
-        if self.parsing_failed:
-            return
+            return None
+
+        # Gates for the entry patterns, from cheap checks on s
+        gates = {m.lastgroup for m in bibpatterns.THESIS_DISPATCH_RE.finditer(s)}
+        if gates:
+            gates.add("thesis")
+        # Literal prerequisites of EDITOR ("(ed", "(Ed") and of the INCOLLECTION patterns ("In")
+        if (
+            ("(ed" in s or "(Ed" in s)
+            and "In" in s
+            and bibpatterns.EDITOR.search(s) is not None
+        ):
+            gates.add("editor")
+
+        # None of the entry patterns can match without a year
+        if bibpatterns.YEAR_RE.search(s):
+            for find, gate, pattern_typ, handler in _NATURAL_PARSERS:
+                if gate is not None and gate not in gates:
+                    continue
+                m = find(s)
+                if m:
+                    if handler(m, s, d):
+                        typ = pattern_typ
+                    break
 
         # Find doi and url in note; clean note
         note = d.get("note")
@@ -675,7 +825,7 @@ class Record:
             creatorpart += "EtAl"
         if authorcount == 2:
             try:
-                secondcreator = re.split(" and ", creator)[-1].strip()
+                secondcreator = creator.split(" and ")[-1].strip()
                 if "," in secondcreator:
                     creatorpart += secondcreator.split(",")[0]
                 elif " " in secondcreator:
@@ -684,10 +834,10 @@ class Record:
                     creatorpart += secondcreator
             except Exception:
                 pass
-        self.key = creatorpart + yearpart
+        key = creatorpart + yearpart
 
         clean_and_brace_natural(d)
-        self.fields = d
+        return typ, key, tuple(d.items())
 
     def conform(self):
         """
@@ -722,14 +872,7 @@ class Record:
         self.checkdecapitalization()
 
         # Entry checks in parallel by BibTeX type (= `self.typ`)
-        self.checkarticle()
-        self.checkthesis()
-        self.checkbook()
-        self.checkincollection()
-        self.checkinproceedings()
-        self.checkinbook()
-        self.checkmisc()
-        self.checkothertype()
+        _TYPE_CHECKERS.get(self.typ, Record.checkothertype)(self)
 
     def report(self):
         """
@@ -803,36 +946,30 @@ class Record:
             return ""
         
         # Delete pages like a page count, "pages = {123 pp.},"
-        if re.match(r"^\d+\s*(pp\.?|pages)$", pages, re.IGNORECASE):
+        if _PAGES_COUNT_RE.match(pages):
             del self.fields["pages"]
             return ""
 
         # Normalize dashes (U+2012 figure dash, U+2013 en dash, U-2014 em dash, U+2212 minus sign) and trim whitespace
-        pages = re.sub(r"\s*(?:-+|‒|–|—|−)+\s*", "--", pages)
+        pages = _DASH_NORM_RE.sub("--", pages)
 
         # Replace semicolons with commas for multiple ranges
-        pages = re.sub(r"\s*[;,]\s*", ", ", pages)
+        pages = _PAGES_SEP_RE.sub(", ", pages)
         
         # Parse article id by changing it to pages, e.g. "pages = {Article ID 34}," to "pages = {34},"
         match = bibpatterns.ARTICLE_ID_RE.match(pages)
         pages = match.group(1) if match else pages
 
         # Flag nonstandard pages
-        unit = r'(?:[a-zA-Z]?\d+|[ivxlcdm]+)'
-        range_ =  fr'{unit}--{unit}'
-        entry = fr'(?:{unit}|{range_})'
-        pattern = re.compile(fr'^{entry}(?:, {entry})*$')
-        if not pattern.match(pages):
+        if not _PAGES_VALID_RE.match(pages):
             self.errors.append(f"non-standard pages: {pages}")
             
         # Flag capital Roman numerals
-        range_Roman = re.compile(fr'^[IVXLCDM]+--[IVXLCDM]+$')
-        if range_Roman.match(pages):
+        if _PAGES_ROMAN_RE.match(pages):
             self.errors.append(f"capital Roman numerals in pages: {pages}")
             
         # Flag redundant range, e.g. 12--12
-        range_capture = re.compile(fr'({unit})--({unit})')
-        match = range_capture.fullmatch(pages)
+        match = _PAGES_RANGE_RE.fullmatch(pages)
         if match:
             start, end = match.groups()
             if start == end:
@@ -844,8 +981,8 @@ class Record:
         """
         Apply decapitalization protection, i.e. curly braces {}, to all title-like fields
         Decapitalization applies to:
-            likely titles of proceedings, via bibpatterns.PROCEEDINGS_RE
-            propernouns, via bibpatterns.PRESERVATIONPATTERN
+            likely titles of proceedings, via bibpatterns.PROCEEDINGS_CI_RE
+            propernouns, via bibpatterns.TITLEPROTECTION_RE (as in PRESERVATIONPATTERN)
             first word of a likely subtitle, e.g. "title = {Syntax: The comma}," -> "title = {Syntax: {T}he comma},"
             Binnenmajuskeln, (conference) acronyms or InterCaps, e.g. OpenAI, ICPhS
             lone capitals
@@ -867,30 +1004,30 @@ class Record:
             original = trim_braces(original)
             protected = original
             
-            # Capitalize and protect first letter after a space after colon, question mark, or exclamation mark, as a subtitle
-            # Example: "Maintitle: the subtitle" → "Maintitle: {T}he subtitle"
-            protected = bibpatterns.MAINTITLE_RE.sub(
-                lambda match: match.group(1) + " " + add_braces(match.group(2).upper()),
-                protected
-            )
-            
-            # Protect Binnenmajuskeln, acronyms, InterCaps
-            protected = bibpatterns.CAMELCASE_RE.sub(r"{\1}", protected)
-
-            # Protect lone capitals (e.g., " A " → " {{A}} ")
-            protected = re.sub(r" ([A-Z]) ", r" {{\1}} ", protected)
-
-            # Protect proper nouns
-            for match in bibpatterns.PRESERVATIONPATTERN.finditer(protected):
-                group = match.group(1)
-                protected = protected.replace(group, "{%s}" % group)
+            # Skip the protection pass for a title which cannot match TITLEPROTECTION_RE:
+            # without capitals, subtitle marks and proper nouns in lowercase
+            if (
+                original != original.lower()
+                or ":" in original or "?" in original or "!" in original
+                or any(noun in original for noun in bibpatterns.LOWERCASE_PROPERNOUNS)
+            ):
+                # In one pass over the title, leftmost match first:
+                # Capitalize and protect first letter after a space after colon, question mark, or exclamation mark, as a subtitle
+                # Example: "Maintitle: the subtitle" → "Maintitle: {T}he subtitle"
+                # Protect proper nouns
+                # Protect Binnenmajuskeln, acronyms, InterCaps
+                # Protect lone capitals (e.g., " A " → " {{A}} ")
+                protected = bibpatterns.TITLEPROTECTION_RE.sub(_protect_title_match, protected)
+
+            # Conference/proceedings keywords, capitalized or lowercase
+            keywords = bibpatterns.PROCEEDINGS_CI_RE.findall(protected)
 
             # Protect entire title of proper name of conference/proceedings, trusting original capitalization 
-            if bibpatterns.PROCEEDINGS_RE.search(protected):
+            if not bibpatterns.PROCEEDINGS_WORDS.isdisjoint(keywords):
                 protected = add_braces(protected)
             
             # Flag title with lowercase conference/proceedings keyword
-            if bibpatterns.PROCEEDINGS_LC_RE.search(protected):
+            if not bibpatterns.PROCEEDINGS_LC_WORDS.isdisjoint(keywords):
                 self.errors.append(f"Proper name of proceedings/conference not capitalized/protected?: {protected}")
             
             if original != protected:
@@ -930,20 +1067,17 @@ class Record:
             return  # No volume pattern found
         
         volume_match = match.group(3)
-        volumepattern_match = match.group()
         
-        # Isolate title by removing volume_patternmatch
-        titlelike = value.replace(volumepattern_match, "")
+        # Isolate title by cutting out the span of the volume pattern
+        titlelike = value[:match.start()] + value[match.end():]
 
         # Clean up trailing punctuation 
-        trailing_re = re.compile(r'^\{(.*?)[,:;. ]+\}$')
-        trailing_match = trailing_re.search(titlelike)
+        trailing_match = _TRAILING_PUNCT_RE.search(titlelike)
         if trailing_match:
             titlelike = add_braces(trailing_match.group(1))
 
         # Clean up leading punctuation
-        leading_re = re.compile(r'^\{[,:;. ]+(.*?)\}$')
-        leading_match = leading_re.search(titlelike)
+        leading_match = _LEADING_PUNCT_RE.search(titlelike)
         if leading_match:
             titlelike = add_braces(leading_match.group(1))
 
@@ -984,15 +1118,13 @@ class Record:
         Flag double initials (e.g. "Watt, JJ"
         """
         
-        capcap_re = re.compile(r' [A-Z][A-Z] ')
-        finalcapcap_re = re.compile(r' [A-Z][A-Z]}$')
         for t in name_fields:
             value = self.fields.get(t)
             if is_real_value(value):
-                value = re.sub(r"([A-Z])\.([A-Z])", r"\1. \2", value)
-                value = re.sub(" ([A-Z])(?= )", r" \1.", value)
-                value = re.sub(" ([A-Z])}$", r" \1.}", value)
-                if capcap_re.search(value) or finalcapcap_re.search(value):
+                value = _INITIALS_NOSPACE_RE.sub(r"\1. \2", value)
+                value = _INITIAL_NODOT_RE.sub(r" \1.", value)
+                value = _FINAL_INITIAL_NODOT_RE.sub(r" \1.}", value)
+                if _CAPCAP_RE.search(value) or _FINAL_CAPCAP_RE.search(value):
                     self.errors.append(f"possible double initials: {self.fields[t]}")
                 self.fields[t] = value
 
@@ -1002,23 +1134,15 @@ class Record:
         Flag any other unescape ampersand.
         """
         
-        for t in name_fields:
-            value = self.fields.get(t)
-            if is_real_value(value):
-                value = value.replace(r" & ", " and ")
-                value = value.replace(r" \& ", " and ")
-                self.fields[t] = value
-                if bibpatterns.AMP_RE.search(value):
-                    self.errors.append(f"unescaped ampersand {t}: {value}")
-
-        for t in [
-            "address", "publisher", "school", "institution", "journal", "series", 
-            "title", "booktitle", "maintitle", "subtitle", 
-            "volume", "number", "note", "howpublished", "addendum"
-        ]:
+        for t, is_name in _AMPERSAND_FIELDS.items():
             value = self.fields.get(t)
-            if is_real_value(value):
-                value = value.replace(r" & ", " \& ")
+            # Nothing to replace or flag without an ampersand
+            if is_real_value(value) and "&" in value:
+                if is_name:
+                    value = value.replace(r" & ", " and ")
+                    value = value.replace(r" \& ", " and ")
+                else:
+                    value = value.replace(r" & ", " \& ")
                 self.fields[t] = value
                 if bibpatterns.AMP_RE.search(value):
                     self.errors.append(f"unescaped ampersand {t}: {value}")
@@ -1030,11 +1154,14 @@ class Record:
         
         for t in name_fields:
             value = self.fields.get(t)
-            if is_real_value(value):
-                ands = value.count(" and ")
-                commas = value.count(",")
-                if commas > ands + 1:
-                    self.errors.append(f"problem with commas in {t}: {value}")
+            if not is_real_value(value):
+                continue
+            commas = value.count(",")
+            # fewer than two commas can never exceed the number of 'and's plus one
+            if commas < 2:
+                continue
+            if commas > value.count(" and ") + 1:
+                self.errors.append(f"problem with commas in {t}: {value}")
 
     def checketal(self):
         """
@@ -1043,14 +1170,13 @@ class Record:
 
         for t in name_fields:
             name = self.fields.get(t)
-            if name:
-                if re.search(r" et\.? al", name):
-                    self.fields[t] = re.sub(
-                        r" et\.? al",
-                        r" \\biberror{et al}",
-                        name
-                    )
-                    self.errors.append(f"literal et al {t}: {self.fields[t]}")
+            if name and (" et al" in name or " et. al" in name):
+                self.fields[t] = (
+                    name
+                    .replace(" et. al", r" \biberror{et al}")
+                    .replace(" et al", r" \biberror{et al}")
+                )
+                self.errors.append(f"literal et al {t}: {self.fields[t]}")
 
     def checkedition(self):
         """
@@ -1065,33 +1191,25 @@ class Record:
                 
         raw = edn  # Preserve original for logging if needed
                 
-        # Strip braces, trim whitespace, and lowercase
+        # Strip braces
         edn = trim_braces(edn)
-        edn = edn.lower()  
+        # Fast path for the common case of a plain numeral
+        if edn.isdecimal():
+            self.fields["edition"] = add_braces(edn)
+            return
 
-        ordinal_map = {
-            "first": "1", "1st": "1",
-            "second": "2", "2nd": "2",
-            "third": "3", "3rd": "3",
-            "fourth": "4", "4th": "4",
-            "fifth": "5", "5th": "5",
-            "sixth": "6", "6th": "6",
-            "seventh": "7", "7th": "7",
-            "eighth": "8", "8th": "8",
-            "ninth": "9", "9th": "9",
-            "tenth": "10", "10th": "10"
-        }
-        edition_keywords = {"ed", "ed.", "edn", "edn.", "edition"}
+        # Lowercase
+        edn = edn.lower()  
         
         parts = edn.split()
         candidate = None
-        if (len(parts) == 2 and parts[1] in edition_keywords) or len(parts) == 1:
+        if (len(parts) == 2 and parts[1] in _EDITION_KEYWORDS) or len(parts) == 1:
             candidate = parts[0]
         if candidate:
             if candidate.isdigit():
                 edn = candidate
-            elif candidate in ordinal_map:
-                edn = ordinal_map[candidate]
+            elif candidate in _ORDINAL_MAP:
+                edn = _ORDINAL_MAP[candidate]
         try:
             int(edn)
             self.fields["edition"] = add_braces(edn)
@@ -1104,13 +1222,6 @@ class Record:
         The month field is not actually used by the bibliography style.
         """
 
-        month_map = {
-            "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-            "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
-            "january": 1, "february": 2, "march": 3, "april": 4, "june": 6, "july": 7, 
-            "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
-        }
-
         raw = self.fields.get("month")
 
         if not raw:
@@ -1128,8 +1239,8 @@ class Record:
         if cleaned.startswith("0") and len(cleaned) == 2:
             cleaned = cleaned[1:]
         # Convert letter month to number if needed
-        if cleaned in month_map:
-            cleaned = str(month_map[cleaned])
+        if cleaned in _MONTH_MAP:
+            cleaned = _MONTH_MAP[cleaned]
 
         # Validate numeric month
         try:
@@ -1173,7 +1284,7 @@ class Record:
             # Case 3: Flag url in note-like field
             for note_field in ["note", "addendum", "annote"]:
                 if note_field in self.fields:
-                    if re.search(r'http', self.fields[note_field]):
+                    if "http" in self.fields[note_field]:
                         self.errors.append(f"URL found in {note_field}: {self.fields[note_field]}")
 
         # Reget url, which could have only been changed in Cases 1 and 2
@@ -1203,7 +1314,7 @@ class Record:
             self.errors.append("url does not start with http")
         
         # Check space in url
-        if url.count(" ") > 0:
+        if " " in url:
             self.errors.append("space in url")
             # Check if urldate is in url
             match = bibpatterns.URL_URLDATE_RE.search(url)
@@ -1235,7 +1346,7 @@ class Record:
                     return
             
         # Flag comma in url
-        if url.count(",") > 0:
+        if "," in url:
             self.errors.append(f"comma in url: {url}")
             
         # Check for doi in url by whitelist of publishers or generic
@@ -1286,17 +1397,10 @@ class Record:
             return
         
         # Flag blacklist of urls
-        nonsites = (
-            "ebrary",
-            "degruyter",
-            "myilibrary",
-            "academia",
-            "ebscohost",
-            "researchgate",
-        )
-        for n in nonsites:
+        for n in _NONSITES:
             if n in url:
                 self.errors.append(f"use url only for for true repositories or for material not available elsewhere: {url}")
+                break
         
         # Reset surviving url
         if url:
@@ -1318,8 +1422,20 @@ class Record:
         if urldate:
             clean_date = trim_braces(urldate)
             try:
-                dt = datetime.strptime(clean_date, "%Y-%m-%d")
-                self.fields["urldate"] = add_braces(dt.strftime("%Y-%m-%d"))
+                # Canonical dates are only validated by the fast C parser;
+                # anything else (e.g. unpadded 2020-1-5) goes through strptime
+                if (
+                    len(clean_date) == 10
+                    and clean_date[4] == clean_date[7] == "-"
+                    and clean_date[0] != "0"
+                    and clean_date.isascii()
+                    and clean_date.replace("-", "").isdigit()
+                ):
+                    datetime.fromisoformat(clean_date)
+                    self.fields["urldate"] = add_braces(clean_date)
+                else:
+                    dt = datetime.strptime(clean_date, "%Y-%m-%d")
+                    self.fields["urldate"] = add_braces(dt.strftime("%Y-%m-%d"))
             except ValueError:
                 self.errors.append(f"invalid urldate format: {clean_date}")
 
@@ -1344,13 +1460,16 @@ class Record:
         raw = trim_braces(raw)
         original = raw
 
+        # Fast path for a bare canonical doi, which none of the cleanup below would change
+        if not raw.endswith(".") and "doi" not in raw.lower() and bibpatterns.DOI_RE.fullmatch(raw):
+            self.fields["doi"] = add_braces(raw)
+            return
+
         # Remove trailing period if present; unescape underscore; remove known doi-like prefix
         if raw.endswith("."):
             raw = raw[:-1]
         raw = raw.replace("\\_", "_")
-        raw = re.sub(r"\bdoi:\s*", "", raw, flags=re.IGNORECASE)
-        raw = re.sub(r"\bhttps?://(?:dx\.)?doi\.org/", "", raw, flags=re.IGNORECASE)
-        raw = re.sub(r"\bdoi\.org/", "", raw, flags=re.IGNORECASE)
+        raw = _DOI_PREFIX_RE.sub("", raw)
 
         # Check if doi remains
         match = bibpatterns.DOI_RE.fullmatch(raw)
@@ -1439,16 +1558,15 @@ class Record:
             self.fields["school"] = self.fields["institution"]
             del self.fields["institution"]
 
-        # Expand school name
-        if self.fields.get("school") is not None and self.fields["school"] in bibpatterns.SCHOOL_FULL:
-            self.fields["school"] = bibpatterns.SCHOOL_FULL[self.fields["school"]]
-
-        # Lookup address if school but no address
-        if self.fields.get("address") is None and self.fields.get("school") is not None and self.fields["school"] in bibpatterns.SCHOOL_ADDRESS:
-            self.fields["address"] = bibpatterns.SCHOOL_ADDRESS[self.fields["school"]]
+        # Expand school name and lookup address if school but no address
+        info = _SCHOOL_INFO.get(self.fields.get("school"))
+        if info is not None:
+            school, address = info
+            self.fields["school"] = school
+            if address is not None and self.fields.get("address") is None:
+                self.fields["address"] = address
         
-        mandatory = ["author", "title", "address", "school", "year"]
-        for m in mandatory:
+        for m in _MANDATORY_FIELDS["thesis"]:
             self.handleerror(m)
         self.addsortname()
 
@@ -1460,7 +1578,7 @@ class Record:
         thesistype = self.fields.get("type")
         if thesistype:
             # Flag unwanted capitalization e.g. "type = {Doctoral Dissertation}," 
-            if re.search(r"\s.*?(Thesis|Dissertation)", thesistype):
+            if _THESIS_TYPE_RE.search(thesistype):
                 self.errors.append(f"type field may be in Title Case: {thesistype}")
 
     def checkbook(self):
@@ -1473,8 +1591,7 @@ class Record:
 
         self.checkpublisheraddress()
 
-        mandatory = ["year", "title", "address", "publisher"]
-        for m in mandatory:
+        for m in _MANDATORY_FIELDS["book"]:
             self.handleerror(m)
 
         if self.fields.get("series") is not None:
@@ -1533,8 +1650,6 @@ class Record:
         if self.typ != "article":
             return
 
-        mandatory = ["author", "year", "title", "journal", "volume"]
-
         # Move number to volume, if number but no volume
         volume = self.fields.get("volume")
         number = self.fields.get("number")
@@ -1542,7 +1657,7 @@ class Record:
             self.fields["volume"] = number
             del self.fields["number"]
 
-        for m in mandatory:
+        for m in _MANDATORY_FIELDS["article"]:
             self.handleerror(m)
         self.addsortname()
        
@@ -1576,8 +1691,8 @@ class Record:
                 self.errors.append(f"use one place only: {address}")
         else:
             publisher_lower = publisher.lower()
-            for substrings, address in bibpatterns.PUBLISHER_ADDRESS.items():
-                if any(sub in publisher_lower for sub in substrings):
+            for sub, address in bibpatterns.PUBLISHER_ADDRESS_FLAT.items():
+                if sub in publisher_lower:
                     self.fields["address"] = address
                     break
 
@@ -1709,8 +1824,7 @@ class Record:
         if self.typ != "misc":
             return
 
-        mandatory = ["author", "title", "year"]
-        for m in mandatory:
+        for m in _MANDATORY_FIELDS["misc"]:
             self.handleerror(m)
 
         # Expect either 'note' or 'howpublished'
@@ -1723,17 +1837,10 @@ class Record:
         Todo: checkmanual, checktechreport, etc.
         """
 
-        known_types = {
-            "article", "book", 
-            "inbook", "incollection", "inproceedings",
-            "thesis", "phdthesis", "mastersthesis", 
-            "misc"
-        }
-        if self.typ in known_types:
+        if self.typ in _KNOWN_TYPES:
             return
 
-        mandatory = ["author", "title", "year"]
-        for m in mandatory:
+        for m in _MANDATORY_FIELDS["other"]:
             self.handleerror(m)
         self.addsortname()
         self.checkpublisheraddress()
@@ -1767,9 +1874,7 @@ class Record:
         if self.parsing_failed:
             return ""
         
-        try:
-            self.typ
-        except AttributeError:
+        if self.typ is None:
             print("skipping phantom record, probably a comment")
             return ""
         if self.restrict and self.key not in self.inkeysd:
@@ -1780,15 +1885,98 @@ class Record:
             ",\n\t".join(
                 [
                     "%s = %s" % (f, self.fields[f])
-                    for f in sorted(self.fields.keys())
-                    if f not in excludefields
+                    for f in sorted(self.fields.keys() - excludefields)
                 ]
             ),
         )
         s = s.replace(",,", ",")
         return s
 
-def normalize(s, inkeysd=None, restrict=False, split_preamble=True, bibtexformat=True):
+# Entry check for each type in _KNOWN_TYPES, other types are checked by checkothertype()
+_TYPE_CHECKERS = {
+    "article": Record.checkarticle,
+    "book": Record.checkbook,
+    "inbook": Record.checkinbook,
+    "incollection": Record.checkincollection,
+    "inproceedings": Record.checkinproceedings,
+    "thesis": Record.checkthesis,
+    "phdthesis": Record.checkthesis,
+    "mastersthesis": Record.checkthesis,
+    "misc": Record.checkmisc,
+}
+
+def _iter_entries(s):
+    """
+    Yield the pieces of s separated by a newline, optional whitespace and "@",
+    like re.split(r"\n\s*@", s) but without building the list.
+    """
+    start = 0
+    at = s.find("@")
+    while at != -1:
+        # A separator starts at the first newline of the whitespace before "@"
+        ws = at
+        while ws > start and s[ws - 1].isspace():
+            ws -= 1
+        newline = s.find("\n", ws, at)
+        if newline != -1:
+            yield s[start:newline]
+            start = at + 1
+        at = s.find("@", at + 1)
+    yield s[start:]
+
+def _bibtex_key(entry):
+    """
+    Return the key which parse_bibtex() would add to `keys` for entry, or None.
+    Mirrors the early returns of parse_bibtex() without parsing the fields.
+    """
+    m = _TYPKEYFIELDS_RE.match(entry)
+    if not m:
+        return None
+    remainder = _TRAILING_COMMA_RE.sub('}', m.group(3).strip())
+    if not any(_split_bibtex_fields(remainder)):
+        return None
+    return m.group(2)
+
+# Options shared by all entries in a worker process of normalize()
+_worker_options = None
+
+def _init_worker(bibtexformat, inkeysd, restrict):
+    global _worker_options
+    _worker_options = (bibtexformat, inkeysd, restrict)
+
+def _process_entry(task):
+    """
+    Build the Record for one entry in a worker process of normalize().
+    task is (entry, duplicate_key), with duplicate_key the entry key if an earlier
+    entry of the input has the same key, as determined by the parent process.
+    """
+    entry, duplicate_key = task
+    bibtexformat, inkeysd, restrict = _worker_options
+    keys.clear()
+    if duplicate_key is not None:
+        keys[duplicate_key] = True
+    record = Record(
+        entry,
+        bibtexformat=bibtexformat,
+        inkeysd=inkeysd,
+        restrict=restrict,
+        reporting=[]
+    )
+    # The parent holds the same dict; don't send it back with every record
+    record.inkeysd = None
+    return record
+
+def _report_failed_entry(entry, record, e):
+    # verbose error message for debugging
+    print("  Error processing record:")
+    print("  Record preview:", repr(entry[:200]))
+    print("  Record type:", getattr(record, "typ", "unknown"))
+    print("  Record key:", getattr(record, "key", "unknown"))
+    print("  Fields:", getattr(record, "fields", "not available"))
+    print("  Exception type:", type(e).__name__)
+    print("  Exception message:", str(e))
+
+def normalize(s, inkeysd=None, restrict=False, split_preamble=True, bibtexformat=True, jobs=1):
     """
     Normalize a BibTeX file or bibliography list into BibTeX format.
 
@@ -1798,59 +1986,114 @@ def normalize(s, inkeysd=None, restrict=False, split_preamble=True, bibtexformat
         restrict (bool): Whether to limit output to keys in `inkeysd`.
         split_preamble (bool): Legacy argument, now ignored.
         bibtexformat (bool): If True, expects BibTeX entries; if False, expects one reference per line.
+        jobs (int): Number of worker processes for parsing the entries. Defaults to 1, no workers.
+            With several workers, duplicate keys are still detected in input order, 
+            but the warnings of different entries may be printed out of order.
 
     Returns:
         str: Text of all normalized entries in BibTeX format.
     """
+
+    return "".join(iter_normalized(s, inkeysd, restrict, split_preamble, bibtexformat, jobs))
+
+def _iter_output(head, texts):
+    """
+    Yield the pieces of the output text of normalize(): each string in head,
+    then each of the BibTeX texts, all separated by blank lines.
+    """
+    for part in head:
+        yield part
+        yield "\n\n"
+    separator = ""
+    for text in texts:
+        yield separator
+        yield text
+        separator = "\n\n"
+
+def iter_normalized(s, inkeysd=None, restrict=False, split_preamble=True, bibtexformat=True, jobs=1):
+    """
+    Like normalize(), but return an iterator over pieces of the output text,
+    so that it can be written out without building one string for all entries.
+    All entries are parsed, checked and rendered before this function returns.
+    """
  
     if inkeysd is None:
         inkeysd = {}
 
     s = s.strip()
     
-    input_entries = []
     if bibtexformat:
-        bibtex_entries = re.split(r"\n\s*@", s)
         if s.startswith('@'):
-            input_entries = bibtex_entries[:]
-            if input_entries:
-                input_entries[0] = input_entries[0].lstrip('@')
+            input_entries = _iter_entries(s.lstrip('@'))
             preamble = ''
         else:
-            preamble = bibtex_entries[0].strip()
-            input_entries = bibtex_entries[1:]
+            input_entries = _iter_entries(s)
+            preamble = next(input_entries).strip()
     else:
+        # Collapse whitespace within lines and skip blank lines
         input_entries = [
-            re.sub(r'\s+', ' ', line).strip()
-            for line in s.splitlines()
-            if line.strip()
+            line for line in (" ".join(raw.split()) for raw in s.splitlines()) if line
         ]
         preamble = ''
 
     processed_records = []
-    for entry in input_entries:
-        temp_record = None
-        try:
-            temp_record = Record(
-                entry,
-                bibtexformat=bibtexformat,
-                inkeysd=inkeysd,
-                restrict=restrict,
-                reporting=[]
-            )
-            processed_records.append(temp_record)
-        except Exception as e:
-            # verbose error message for debugging
-            print("  Error processing record:")
-            print("  Record preview:", repr(entry[:200]))
-            print("  Record type:", getattr(temp_record, "typ", "unknown"))
-            print("  Record key:", getattr(temp_record, "key", "unknown"))
-            print("  Fields:", getattr(temp_record, "fields", "not available"))
-            print("  Exception type:", type(e).__name__)
-            print("  Exception message:", str(e))
-            raise
-
-    nonparsed = [record for record in processed_records if record.parsing_failed]
+    pool = None
+    if jobs > 1:
+        input_entries = list(input_entries)
+        if len(input_entries) > 1:
+            try:
+                pool = multiprocessing.Pool(
+                    jobs,
+                    initializer=_init_worker,
+                    initargs=(bibtexformat, inkeysd, restrict)
+                )
+            except (OSError, ImportError, NotImplementedError) as e:
+                # e.g. no working semaphores on this platform
+                print(f"  could not start {jobs} worker processes ({e}), processing entries sequentially")
+    if pool is not None:
+        # Detect duplicate keys here, as each worker only sees its own entries
+        tasks = []
+        for entry in input_entries:
+            duplicate_key = None
+            key = _bibtex_key(entry) if bibtexformat else None
+            if key is not None:
+                if key in keys:
+                    duplicate_key = key
+                keys[key] = True
+            tasks.append((entry, duplicate_key))
+        with pool:
+            results = pool.imap(_process_entry, tasks, chunksize=64)
+            for entry in input_entries:
+                try:
+                    temp_record = next(results)
+                except Exception as e:
+                    _report_failed_entry(entry, None, e)
+                    raise
+                temp_record.inkeysd = inkeysd
+                processed_records.append(temp_record)
+    else:
+        for entry in input_entries:
+            temp_record = None
+            try:
+                temp_record = Record(
+                    entry,
+                    bibtexformat=bibtexformat,
+                    inkeysd=inkeysd,
+                    restrict=restrict,
+                    reporting=[]
+                )
+                processed_records.append(temp_record)
+            except Exception as e:
+                _report_failed_entry(entry, temp_record, e)
+                raise
+
+    parsed_records = []
+    nonparsed = []
+    for record in processed_records:
+        if record.parsing_failed:
+            nonparsed.append(record)
+        else:
+            parsed_records.append(record)
     any_failed = bool(nonparsed)
     if any_failed:
         if bibtexformat:
@@ -1862,27 +2105,24 @@ def normalize(s, inkeysd=None, restrict=False, split_preamble=True, bibtexformat
                 record.raw_entry for record in nonparsed
             )
 
-    parsed_records = [record for record in processed_records if not record.parsing_failed]
- 
     # Reverse order by type, then alpahbetical order by key
-    records_by_key = sorted(
-        parsed_records,
-        key=lambda record: record.key or ""
-    )
+    # Types are ranked in reverse order up front, so one sort suffices
+    typs = sorted({record.typ or "" for record in parsed_records}, reverse=True)
+    typ_rank = {typ: rank for rank, typ in enumerate(typs)}
     sorted_records = sorted(
-        records_by_key,
-        key=lambda record: record.typ or "",
-        reverse=True
+        parsed_records,
+        key=lambda record: (typ_rank[record.typ or ""], record.key or "")
     )
    
-    output = "\n\n".join(
-        record.bibtex() for record in sorted_records if record.bibtex()
-    )
-    
-    if preamble:
-        output = preamble + "\n\n" + output
-        
+    # Failed entries first, then the preamble, then the (possibly empty) records
+    head = []
     if any_failed:
-        output = parsing_failure + "\n\n" + output
+        head.append(parsing_failure)
+    if preamble:
+        head.append(preamble)
+    
+    # Render here, so that nothing is left to run while the output is written
+    bibtexs = (record.bibtex() for record in sorted_records)
+    texts = [text for text in bibtexs if text]
     
-    return output
\ No newline at end of file
+    return _iter_output(head, texts)
\ No newline at end of file
@@ -1,7 +1,8 @@
+import re
 import unittest
 
 from latex import indextools, asciify, delatex, sanity
-from bib import bibtools
+from bib import bibtools, bibpatterns
 
 
 class TestSanity(unittest.TestCase):
@@ -49,6 +50,29 @@ class TestASCII(unittest.TestCase):
         self.assertEqual(result, "aaaaaaaaaaaa")
 
 
+class TestBibPatterns(unittest.TestCase):
+    """Test the patterns for inline literature references"""
+
+    def test_adversarial(self):
+        """Test that malformed references are only tried from line starts"""
+        entrypatterns = (
+            bibpatterns.BOOK,
+            bibpatterns.ARTICLE,
+            bibpatterns.INCOLLECTION,
+            bibpatterns.INCOLLECTIONPARENS,
+            bibpatterns.INCOLLECTIONMISSING,
+            bibpatterns.MASTERSTHESIS,
+            bibpatterns.PHDTHESIS,
+            bibpatterns.MISC,
+        )
+        s = "A" * 200 + "."
+        for pattern in entrypatterns:
+            # an unanchored search would retry from every position of s
+            self.assertTrue(pattern.pattern.startswith("^"))
+            self.assertTrue(pattern.flags & re.MULTILINE)
+            self.assertIsNone(pattern.search(s))
+
+
 class TestBibConversion(unittest.TestCase):
     """Test the conversion of inline literature references to BibTex"""
 
@@ -233,6 +257,158 @@ class TestBibConversion(unittest.TestCase):
             record = bibtools.normalize(s)
             self.assertEqual(record, expected)
 
+    def test_titleprotection(self):
+        titletests = (
+            # maintitle colon followed by a proper noun
+            ("Phonology: English vowels", "{Phonology: {E}nglish vowels}"),
+            # hyphenated pair of proper nouns
+            (
+                "Oath and pledge in Anglo-Saxon legal culture",
+                "{Oath and pledge in {Anglo}-{Saxon} legal culture}",
+            ),
+            # CamelCase words
+            ("Typesetting with LaTeX and BibTeX", "{Typesetting with {LaTeX} and {BibTeX}}"),
+            # lone capital
+            ("Plan B in practice", "{Plan {{B}} in practice}"),
+            # nothing to protect
+            ("A survey of vowel systems", "{A survey of vowel systems}"),
+        )
+        for i, (title, expected) in enumerate(titletests):
+            s = (
+                "article{Title%d,\n\tauthor = {Smith, John},\n\ttitle = {%s},\n"
+                "\tjournal = {Journal},\n\tvolume = {1},\n\tyear = {2000}\n}" % (i, title)
+            )
+            record = bibtools.Record(s, bibtexformat=True)
+            self.assertEqual(record.fields["title"], expected)
+
+    def test_normalize_jobs(self):
+        s = """@book{Smith2000,\n\tauthor = {Smith, John},\n\ttitle = {A first book},\n\tpublisher = {Press},\n\taddress = {Berlin},\n\tyear = {2000}\n}
+
+@book{Smith2000,\n\tauthor = {Smith, John},\n\ttitle = {A second book},\n\tpublisher = {Press},\n\taddress = {Berlin},\n\tyear = {2000}\n}
+
+@book{NoFields}
+
+@article{Doe2001,\n\tauthor = {Doe, Jane},\n\ttitle = {An article},\n\tjournal = {Journal},\n\tvolume = {1},\n\tyear = {2001}\n}
+"""
+        results = []
+        for jobs in (1, 2):
+            bibtools.keys.clear()
+            output = bibtools.normalize(s, jobs=jobs)
+            results.append((output, dict(bibtools.keys)))
+        self.assertEqual(results[0], results[1])
+        self.assertTrue(results[0][0].startswith("@book{NoFields}"))
+        self.assertEqual(results[0][1], {"Smith2000": True, "Doe2001": True})
+
+    def test_parse_bibtex(self):
+        fieldtests = (
+            # braced, quoted and bare values
+            (
+                """\tauthor = {Smith, John},\n\ttitle = "Quoted title",\n\tyear = 2000""",
+                {"author": "{Smith, John}", "title": "{Quoted title}", "year": "2000"},
+            ),
+            # empty braced values are dropped
+            (
+                """\tauthor = {Smith, John},\n\tnote = {},\n\tyear = {2000}""",
+                {"author": "{Smith, John}", "year": "{2000}"},
+            ),
+            # trailing comma after the last field
+            (
+                """\tauthor = {Smith, John},\n\tyear = {2000},""",
+                {"author": "{Smith, John}", "year": "{2000}"},
+            ),
+            # "}," inside a value
+            (
+                """\tauthor = {Smith, John},\n\ttitle = {Words {Nested}, more},\n\tyear = {2000}""",
+                {"author": "{Smith, John}", "title": "{Words {Nested}, more}", "year": "{2000}"},
+            ),
+            # known limitation: "}," at the end of a line inside a value ends the field
+            (
+                """\tauthor = {Smith, John},\n\ttitle = {Words {Nested},\n more},\n\tyear = {2000}""",
+                {"author": "{Smith, John}", "title": "{Words {Nested}", "year": "{2000}"},
+            ),
+        )
+        for i, (body, expected) in enumerate(fieldtests):
+            record = bibtools.Record("book{Fields%d,\n%s\n}" % (i, body), bibtexformat=True)
+            self.assertFalse(record.parsing_failed)
+            fields = {k: v for k, v in record.fields.items() if "biberror" not in v}
+            self.assertEqual(fields, expected)
+
+    def test_parse_natural(self):
+        naturaltests = (
+            (
+                """Gray, Hazel. 2013. Locatives in Ikizu. Leiden: Leiden University. (M.A. thesis).""",
+                "mastersthesis",
+                {"school": "{Leiden University}", "title": "{Locatives in Ikizu}"},
+            ),
+            (
+                """Baker, Mark Cleland. 1985. Incorporation: A Theory of Grammatical Function Changing. Cambridge, MA: Massachusetts Institute of Technology. (PhD dissertation)""",
+                "phdthesis",
+                {"school": "{Massachusetts Institute of Technology}", "address": "{Cambridge, MA}"},
+            ),
+            (
+                """Archer, Dawn. 2010. Speech acts. In Andreas H. Jucker & Irma Taavitsainen (eds.), Historical pragmatics, 379-418. Berlin, Germany: Walter de Gruyter GmbH & Co.""",
+                "incollection",
+                {"editor": "{Andreas H. Jucker and Irma Taavitsainen}", "pages": "{379--418}"},
+            ),
+            (
+                """Doe, Jane. 2011. Chapter. In Max Mustermann (ed.), Big book. (pp. 12-34). Berlin: Language Science Press.""",
+                "incollection",
+                {"booktitle": "{Big book}", "pages": "{12--34}", "publisher": "{Language Science Press}"},
+            ),
+            (
+                """Doe, Jane. 2011. Chapter. In Max Mustermann (eds.) Big book.""",
+                "incollection",
+                {"editor": "{Max Mustermann}", "booktitle": "{Big book.}"},
+            ),
+            (
+                """Iverson, Gregory K. 1983. Korean /s/. Journal of Phonetics 11. 191-200.""",
+                "article",
+                {"journal": "{Journal of Phonetics}", "volume": "{11}", "pages": "{191--200}"},
+            ),
+            (
+                """Mufwene, Salikoko. 2001. The Ecology of Language Evolution. Cambridge: Cambridge University Press.""",
+                "book",
+                {"address": "{Cambridge}", "publisher": "{Cambridge University Press}"},
+            ),
+            # matches the book pattern, but without a publisher it is left as an empty misc
+            ("""Doe, Jane. 2013. Some misc thing. Available online.""", "misc", {}),
+        )
+        for s, typ, expected in naturaltests:
+            record = bibtools.Record(s, bibtexformat=False)
+            self.assertEqual(record.typ, typ)
+            for field, value in expected.items():
+                self.assertEqual(record.fields[field], value)
+            if not expected:
+                self.assertEqual(record.key, "Anonymous9999")
+
+    def test_split_bibtex_fields(self):
+        # the field split must agree with the regular expression it replaced
+        split_re = re.compile(r"(?<=\})[ \t]*,[ \t]*\n\s*")
+        remainders = (
+            "author = {Smith, John},\n\ttitle = {A title},\n\tyear = {2000}",
+            "author = {Smith, John} , \n\n\t  title = {A\n  title}",
+            "author = {Smith},\r\n\ttitle = {A title}",
+            "year = 2000,\n\ttitle = {A title}",
+            "title = {Words {Nested},\n more},\n\tyear = {2000}",
+            "",
+        )
+        for remainder in remainders:
+            expected = [re.sub(r"\s+", " ", line.strip()) for line in split_re.split(remainder)]
+            self.assertEqual(list(bibtools._split_bibtex_fields(remainder)), expected)
+
+    def test_iter_entries(self):
+        s = """% preamble comment
+@string{lsp = {Language Science Press}}
+
+@book{Smith2000,\n\tauthor = {Smith, John},\n\ttitle = {A book},\n\tnote = {Contact: john@example.org},\n\tpublisher = {Press},\n\taddress = {Berlin},\n\tyear = {2000}\n}
+  @misc{Doe2001,\n\tauthor = {Doe, Jane},\n\ttitle = {Mail\n@home},\n\tyear = {2001}\n}"""
+        # same entries as the split it replaced, including the "@" at the start of a line in a value
+        self.assertEqual(list(bibtools._iter_entries(s)), re.split(r"\n\s*@", s))
+        bibtools.keys.clear()
+        output = bibtools.normalize(s)
+        self.assertIn("% preamble comment\n\n@book{Smith2000,", output)
+        self.assertIn("\tnote = {Contact: john@example.org},\n", output)
+
 
 if __name__ == "__main__":
     unittest.main()
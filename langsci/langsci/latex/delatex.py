@@ -16,6 +16,11 @@ import re
 #LATEXDIACRITICS = """'`^~"=.vdHuk"""
 LATEXDIACRITICS = """'`^~"=.vdHukcrb"""
 
+# Compiled patterns for LaTeX diacritics like {\'{e}}, \'{e} and \'e
+_BRACED_DIACRITIC_RE = re.compile(r"{\\[%s]{([A-Za-z])}}" % LATEXDIACRITICS)
+_DIACRITIC_BRACE_RE = re.compile(r"\\[%s]{([A-Za-z])}" % LATEXDIACRITICS)
+_DIACRITIC_RE = re.compile(r"\\[%s]([A-Za-z])" % LATEXDIACRITICS)
+
 
 def dediacriticize(s, stripbraces=True):
     """
@@ -47,12 +52,15 @@ def dediacriticize(s, stripbraces=True):
       str: the input string stripped of LaTeX diacritics
 
     """
+    # nothing to remove without a backslash
+    if "\\" not in s:
+        return s
     tmpstring = s
     if stripbraces:
         # get rid of Latex diacritics like {\'{e}}
-        tmpstring = re.sub(r"{\\[%s]{([A-Za-z])}}" % LATEXDIACRITICS, r"\1", tmpstring)
+        tmpstring = _BRACED_DIACRITIC_RE.sub(r"\1", tmpstring)
     # get rid of Latex diacritics like \'{e}
-    tmpstring = re.sub(r"\\[%s]{([A-Za-z])}" % LATEXDIACRITICS, r"\1", tmpstring)
+    tmpstring = _DIACRITIC_BRACE_RE.sub(r"\1", tmpstring)
     # get rid of Latex diacritics like \'e
-    result = re.sub(r"\\[%s]([A-Za-z])" % LATEXDIACRITICS, r"\1", tmpstring)
+    result = _DIACRITIC_RE.sub(r"\1", tmpstring)
     return result
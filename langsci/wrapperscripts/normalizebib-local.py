@@ -2,7 +2,7 @@
 import argparse
 import os
 import sys
-from langsci.bib.bibtools import normalize
+from langsci.bib.bibtools import iter_normalized
 
 def main():
     parser = argparse.ArgumentParser(
@@ -10,6 +10,12 @@ def main():
     )
     parser.add_argument("input_file", type=str, help="Path to the input .bib or .txt file")
     parser.add_argument("output_file", type=str, help="Path to the normalized output file")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for parsing the entries (default: 1)"
+    )
     args = parser.parse_args()
 
     # Check if input file exists
@@ -27,15 +33,15 @@ def main():
 
         # Choose normalization method based on file extension
         if args.input_file.endswith(".txt"):
-            normalized = normalize(rawtext, bibtexformat=False)
+            normalized = iter_normalized(rawtext, bibtexformat=False, jobs=args.jobs)
         elif args.input_file.endswith(".bib"):
-            normalized = normalize(rawtext, bibtexformat=True)
+            normalized = iter_normalized(rawtext, bibtexformat=True, jobs=args.jobs)
         else:
             raise ValueError("Unsupported file type. Use .bib or .txt")
 
-        # Write the output
+        # Write the output entry by entry
         with open(args.output_file, "w", encoding="utf-8") as outfile:
-            outfile.write(normalized)
+            outfile.writelines(normalized)
 
         print(f"Successfully wrote normalized output to {args.output_file}")
 